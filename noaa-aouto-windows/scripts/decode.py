@@ -10,7 +10,7 @@ import sys
 from pathlib import Path
 import wave
 import numpy as np
-from scipy.signal import decimate
+from scipy.signal import resample_poly
 from datetime import datetime
 
 BASE = Path(__file__).resolve().parents[1]
@@ -36,21 +36,27 @@ def simple_python_apt_decode(wavpath):
         nframes = wf.getnframes()
         audio = wf.readframes(nframes)
         samples = np.frombuffer(audio, dtype=np.int16).astype(np.float32)
-    # normalize
-    samples -= samples.mean()
-    samples /= (np.abs(samples).max()+1e-9)
+    # no audio normalization: the image is min/max scaled below, so a peak pass
+    # changes nothing, and a DC offset only matters at the resampler's edges,
+    # which resample_poly(padtype='mean') handles without a separate mean pass
     # downsample to ~5k
     target_sr = 5512
     factor = int(sr / target_sr) if sr > target_sr else 1
     if factor > 1:
-        samples = decimate(samples, factor)
+        # pad with the signal mean, not zeros: zero padding turns any DC offset
+        # into edge transients that stretch the min/max range used below
+        samples = resample_poly(samples, 1, factor, padtype='mean')
         sr = int(sr / factor)
     # NOAA APT produces 2080 samples per line at ~2.4 kHz audio rate -> approximate lines
     line_length = 2080
     nlines = len(samples) // line_length
     img = samples[:nlines*line_length].reshape((nlines, line_length))
-    # map to 0-255
-    img = ((img - img.min()) / (img.max()-img.min()+1e-9) * 255).astype(np.uint8)
+    # map to 0-255 in place (img is a view of our own samples buffer)
+    lo = img.min()
+    scale = 255.0 / (img.max() - lo + 1e-9)
+    np.subtract(img, lo, out=img)
+    img *= scale
+    img = img.astype(np.uint8)
     # save as PNG via pillow
     try:
         from PIL import Image
@@ -0,0 +1,140 @@
+"""
+passes.py
+Shared pass prediction for schedule.py and record_schedule.py:
+config/TLE loading (cached on the file mtime), the observer location and
+the vectorized AOS/LOS search.
+"""
+import logging
+from datetime import timedelta
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import yaml
+from sgp4.api import Satrec, SatrecArray, jday
+from skyfield.api import wgs84
+from skyfield.sgp4lib import theta_GMST1982
+
+try:
+    from yaml import CSafeLoader as YamlLoader  # libyaml
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+BASE = Path(__file__).resolve().parents[1]
+CONFIG = BASE / "config" / "satellites.yaml"
+
+# Receiver location (Origovägen 4). If predictions are off by a minute or so,
+# the TLEs in satellites.yaml probably need updating.
+MY_LAT = 57.69
+MY_LON = 11.97
+MY_ELEV_M = 0
+
+GEOC = wgs84.latlon(MY_LAT, MY_LON, elevation_m=MY_ELEV_M)
+
+DAY_S = 86400.0
+PASS_STEP_S = 60  # coarse search grid; AOS/LOS are interpolated inside a step
+
+# Observer ECEF position (km) and local vertical, computed once
+_OBS_ECEF = GEOC.itrs_xyz.km
+_LAT, _LON = np.radians(MY_LAT), np.radians(MY_LON)
+_UP = np.array([np.cos(_LAT) * np.cos(_LON), np.cos(_LAT) * np.sin(_LON), np.sin(_LAT)])
+
+log = logging.getLogger('satrec')
+
+
+@lru_cache(maxsize=1)
+def _load(mtime):
+    """Parse the YAML config and build sgp4 Satrec objects. Cached on the file mtime."""
+    log.info("Loading config and TLEs from %s", CONFIG)
+    data = yaml.load(CONFIG.read_text(), Loader=YamlLoader)
+    sats = {satcfg["name"]: Satrec.twoline2rv(satcfg["tle1"].strip(), satcfg["tle2"].strip())
+            for satcfg in data.get("satellites", [])}
+    return data, sats
+
+
+def load_config():
+    """Return (config, sats); only re-parsed when satellites.yaml has changed."""
+    return _load(CONFIG.stat().st_mtime)
+
+
+@lru_cache(maxsize=4)
+def _satrec_array(satrecs):
+    """SatrecArray for a tuple of Satrec; built once per loaded config."""
+    return SatrecArray(list(satrecs))
+
+
+def _elevations(satrecs, t0, t1):
+    """Elevation (deg) of every satellite on a PASS_STEP_S grid from t0 to t1.
+
+    One SatrecArray.sgp4 call propagates all satellites over the whole grid
+    in C; TEME is rotated to ECEF by GMST and projected on the local vertical.
+    Returns (offsets in seconds from t0, elevations of shape (nsat, ntime)).
+    """
+    offsets = np.arange(0, (t1 - t0).total_seconds() + 1, PASS_STEP_S)
+    jd0, fr0 = jday(t0.year, t0.month, t0.day, t0.hour, t0.minute,
+                    t0.second + t0.microsecond * 1e-6)
+    jd = np.full(offsets.shape, jd0)
+    fr = fr0 + offsets / DAY_S
+    err, r, _ = satrecs.sgp4(jd, fr)
+
+    theta, _ = theta_GMST1982(jd, fr)
+    c, s = np.cos(theta), np.sin(theta)
+    ecef = np.stack((c * r[..., 0] + s * r[..., 1],
+                     c * r[..., 1] - s * r[..., 0],
+                     r[..., 2]), axis=-1)
+
+    rho = ecef - _OBS_ECEF
+    el = np.degrees(np.arcsin(rho @ _UP / np.linalg.norm(rho, axis=-1)))
+    el[err != 0] = -90.0  # SGP4 failed (decayed TLE etc.): treat as below horizon
+    return offsets, el
+
+
+def get_all_passes(sats, t0, t1, elev_mask_deg=10):
+    """{name: passes} for every satellite in `sats` from one batched SGP4 run.
+
+    Mask crossings are found on the coarse grid and AOS/LOS are linearly
+    interpolated inside the step, which keeps them within a few seconds.
+    A pass in progress at t0 starts at t0; one still in progress at t1
+    ends at t1.
+    """
+    names = list(sats)
+    if not names:
+        return {}
+    offsets, el = _elevations(_satrec_array(tuple(sats[name] for name in names)), t0, t1)
+    above = el >= elev_mask_deg
+
+    result = {}
+    for name, e, up in zip(names, el, above):
+        passes = []
+        aos = t0 if up[0] else None
+        for i in np.flatnonzero(np.diff(up.astype(np.int8))):
+            frac = (elev_mask_deg - e[i]) / (e[i + 1] - e[i])
+            when = t0 + timedelta(seconds=float(offsets[i] + frac * PASS_STEP_S))
+            if up[i + 1]:  # rise
+                aos = when
+            else:  # set
+                passes.append((aos, when))
+                aos = None
+        if aos is not None:
+            passes.append((aos, t1))
+        result[name] = passes
+    return result
+
+
+def prediction_epoch(now, refresh_minutes=10):
+    """Start of the `refresh_minutes` bucket containing `now`."""
+    return now.replace(minute=now.minute - now.minute % refresh_minutes, second=0, microsecond=0)
+
+
+@lru_cache(maxsize=4)
+def _cached_all_passes(sat_items, t0, minutes_ahead, elev_mask_deg):
+    return get_all_passes(dict(sat_items), t0, t0 + timedelta(minutes=minutes_ahead), elev_mask_deg)
+
+
+def cached_passes(sats, t0, minutes_ahead=24 * 60, elev_mask_deg=10):
+    """get_all_passes from bucket start t0, memoized per (satellite set, t0).
+
+    A config reload builds new Satrec objects, so stale entries are
+    never hit again and simply age out of the LRU.
+    """
+    return _cached_all_passes(tuple(sats.items()), t0, minutes_ahead, elev_mask_deg)
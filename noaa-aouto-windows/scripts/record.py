@@ -33,13 +33,13 @@ def run_record(freq, satname, start_time_iso=None, duration_override=None):
     ts = None
     if start_time_iso:
         ts = iso_to_ts(start_time_iso)
-        now = datetime.utcnow().astimezone(timezone.utc)
+        now = datetime.now(timezone.utc)
         delta = (ts - now).total_seconds()
         if delta > 0:
             print(f"Sleeping {delta:.1f}s until start {ts.isoformat()}Z")
             time.sleep(delta)
     # assemble output filename
-    tnow = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    tnow = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
     out = RECORD_DIR / f"{satname}_{tnow}_{int(freq*1000)}kHz.wav"
     cmd = build_command(freq, str(out))
     print("Starting recording with command:")
@@ -3,151 +3,255 @@ Optimized RTL-SDR satellite recorder
 - Fully driven by config/satellites.yaml (TLEs embedded)
 - Block-based streaming (avoids huge memory allocations)
 - Thread-safe active recordings
-- Watches config file for changes and reloads TLEs automatically
+- Reloads TLEs automatically when the config file changes (checked every scheduler tick)
 - Uses pyrtlsdr for RX (fallback to rtl_fm if desired)
 
 Requirements:
   pip install pyrtlsdr scipy numpy pyyaml apscheduler skyfield
+  (optional) pip install numba  -> JIT FM discriminator on raw uint8 IQ
 
 Usage:
-  - Put your satellites.yaml in project/config/satellites.yaml
-  - Ensure recordings/ and tle/ directories exist (script will create them)
-  - Run: python optimized_rtlsdr_recorder.py
+  - Satellites and TLEs are read from passes.CONFIG (config/satellites.yaml)
+  - WAVs are written to scripts/recordings/raw/ (created on start)
+  - Run from scripts/: python record_schedule.py
 
 """
 
 from pathlib import Path
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 import threading
 import time
-import yaml
+import atexit
 import logging
 import wave
 import struct
+import math
 
 import numpy as np
-from scipy.signal import decimate
+from scipy.signal import firwin, kaiserord, upfirdn
 from pyrtlsdr import RtlSdr
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
-from skyfield.api import Loader, EarthSatellite, wgs84
+
+from passes import load_config, prediction_epoch, cached_passes
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; falls back to bytes_to_iq + fm_demodulate
+    njit = None
 
 # ----------------------
 # CONFIG
 # ----------------------
 PROJECT_ROOT = Path(__file__).resolve().parent
-CONFIG_PATH = PROJECT_ROOT / "config" / "satellites.yaml"
-TLE_DIR = PROJECT_ROOT / "tle"
 RECORD_DIR = PROJECT_ROOT / "recordings" / "raw"
 RECORD_DIR.mkdir(parents=True, exist_ok=True)
-TLE_DIR.mkdir(parents=True, exist_ok=True)
 
 # Receiver settings
 USE_PY_RTLSDR = True
 RTL_SAMPLE_RATE = 2_400_000  # 2.4 MS/s
-CHUNK_SECONDS = 0.25         # seconds per processing chunk
-CHUNK_SAMPLES = int(RTL_SAMPLE_RATE * CHUNK_SECONDS)
+# Fixed read size, a multiple of the 16 KiB RTL-SDR USB transfer: 131072 IQ
+# samples = 256 KiB (~55 ms). A constant size also lets pyrtlsdr reuse its buffer.
+CHUNK_SAMPLES = 16384 * 8
+CHUNK_SECONDS = CHUNK_SAMPLES / RTL_SAMPLE_RATE
 
 # Audio output
 OUT_SAMPLE_RATE = 12000  # final audio sample rate
-DECIMATE_STAGE1 = 50     # 2400000 / 50 = 48000
-DECIMATE_STAGE2 = 4      # 48000 / 4 = 12000
-
-# Location (Göteborg)
-MY_LAT = 57.69
-MY_LON = 11.97
-MY_ELEV_M = 0
-
-# Skyfield
-loader = Loader(str(TLE_DIR))
-ts = loader.timescale()
+DECIMATION = RTL_SAMPLE_RATE // OUT_SAMPLE_RATE  # 2400000 / 200 = 12000
+
+# Anti-alias FIR for the single polyphase decimation stage, designed once.
+# Kaiser design: flat to 4.5 kHz (APT is the 2.4 kHz subcarrier +-2.08 kHz),
+# >= 90 dB down from the 6 kHz output Nyquist, i.e. a 4.5-6 kHz transition band.
+# That narrow a transition at 2.4 MS/s takes ~9100 taps; upfirdn still only
+# computes the kept outputs, about 5 ms per 55 ms chunk.
+FIR_PASS_HZ = 4500
+FIR_STOP_HZ = OUT_SAMPLE_RATE / 2
+FIR_STOP_DB = 90
+FIR_NUM_TAPS, _fir_beta = kaiserord(FIR_STOP_DB, (FIR_STOP_HZ - FIR_PASS_HZ) / (RTL_SAMPLE_RATE / 2))
+FIR_NUM_TAPS |= 1  # odd length: linear-phase type I filter
+FIR_TAPS = firwin(FIR_NUM_TAPS, (FIR_PASS_HZ + FIR_STOP_HZ) / 2, fs=RTL_SAMPLE_RATE,
+                  window=('kaiser', _fir_beta)).astype(np.float32)
+# upper bound on audio samples produced per chunk (chunk + carried FIR tail)
+CHUNK_OUT_SAMPLES = (CHUNK_SAMPLES + FIR_NUM_TAPS) // DECIMATION + 1
+
+# Pass prediction window used by the scheduler (location/TLEs live in passes.py)
+PREDICT_MINUTES_AHEAD = 12 * 60
+PREDICT_REFRESH_MINUTES = 10  # pass lists are reused within this bucket
+PASS_MARGIN_S = 20            # record this long before AOS and after LOS
+SCHEDULE_AHEAD_S = 10 * 60    # queue a 'date' job for passes starting within this
+
+# Scheduler: minute tick + one-shot jobs for recordings, all on one bounded pool
+SCHED_WORKERS = 4
+sched = BackgroundScheduler(executors={'default': ThreadPoolExecutor(SCHED_WORKERS)})
 
 # State
 active_recordings = set()
 active_lock = threading.Lock()
 
-# Config caching
-_config_cache = None
-_config_mtime = None
-_sats_cache = None
+# Shared SDR handle (see get_sdr); one device, one recording at a time
+_sdr = None
+_sdr_lock = threading.Lock()
 
 # Logging
 logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(levelname)s: %(message)s')
 log = logging.getLogger('satrec')
 
 # ----------------------
-# UTIL: load config + build satellites
+# FM demod + decimation helper
 # ----------------------
 
-def load_config(force=False):
-    global _config_cache, _config_mtime, _sats_cache
+def bytes_to_iq(raw, out):
+    """Unpack interleaved uint8 I/Q into complex64, written into float32 `out` (len 2*N).
 
-    if not CONFIG_PATH.exists():
-        raise FileNotFoundError(f"Config not found: {CONFIG_PATH}")
+    Same scaling as pyrtlsdr's packed_bytes_to_iq, but single precision
+    (the ADC is 8-bit) and without allocating a new complex128 array.
+    """
+    np.subtract(raw, 127.5, out=out, dtype=np.float32)
+    out *= 1.0 / 127.5
+    return out.view(np.complex64)
 
-    mtime = CONFIG_PATH.stat().st_mtime
-    if not force and _config_cache is not None and mtime == _config_mtime:
-        return _config_cache, _sats_cache
 
-    log.info("Loading config and TLEs from %s", CONFIG_PATH)
-    data = yaml.safe_load(CONFIG_PATH.read_text())
-    sats = {}
-    for entry in data.get('satellites', []):
-        name = entry['name']
-        tle1 = entry['tle1']
-        tle2 = entry['tle2']
-        sats[name] = EarthSatellite(tle1, tle2, name, ts)
+def fm_demodulate(iq, prev_sample=None):
+    # iq: complex64 array
+    # return float array of instantaneous frequency (unscaled)
+    if prev_sample is not None:
+        iq = np.concatenate(([prev_sample], iq))
+    ph = np.angle(iq[1:] * np.conj(iq[:-1]))
+    return ph, iq[-1]
+
 
-    _config_cache = data
-    _config_mtime = mtime
-    _sats_cache = sats
-    return data, sats
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def fm_demod_kernel(raw, prev_i, prev_q, out):
+        # raw: interleaved offset-binary uint8 I/Q. 2*x - 255 centres it exactly
+        # on 0 in int32 (products reach ~2*255^2, too wide for int16); the
+        # discriminator only needs the ratio, so no float scaling is done.
+        for k in prange(out.shape[0]):
+            i = 2 * np.int32(raw[2 * k]) - 255
+            q = 2 * np.int32(raw[2 * k + 1]) - 255
+            if k == 0:
+                pi, pq = prev_i, prev_q
+            else:
+                pi = 2 * np.int32(raw[2 * k - 2]) - 255
+                pq = 2 * np.int32(raw[2 * k - 1]) - 255
+            out[k] = math.atan2(q * pi - i * pq, i * pi + q * pq)
+else:
+    fm_demod_kernel = None
+
+
+def fm_demodulate_u8(raw, prev_sample=None, out=None):
+    """FM discriminator straight on raw uint8 I/Q bytes (requires numba).
+
+    `prev_sample` is the last centred (I, Q) int pair of the previous block;
+    `out` is an optional preallocated float32 buffer reused across chunks.
+    Returns (phase, last_sample).
+    """
+    if prev_sample is None:
+        prev_sample, raw = (2 * int(raw[0]) - 255, 2 * int(raw[1]) - 255), raw[2:]
+    n = len(raw) // 2
+    if out is None or len(out) < n:
+        out = np.empty(n, dtype=np.float32)
+    ph = out[:n]
+    fm_demod_kernel(raw, prev_sample[0], prev_sample[1], ph)
+    return ph, (2 * int(raw[-2]) - 255, 2 * int(raw[-1]) - 255)
+
+
+class FirDecimator:
+    """Polyphase FIR + decimate, continuous across chunks.
+
+    Holds the unconsumed input tail between calls (the filter state), so only
+    output samples whose filter window is fully covered are produced and chunk
+    boundaries leave no edge artifacts. Taps are designed once at import.
+    """
+
+    def __init__(self, taps=FIR_TAPS, factor=DECIMATION):
+        self.taps = taps
+        self.factor = factor
+        self._first = -(-(len(taps) - 1) // factor)  # first fully-covered output
+        self._tail = np.zeros(0, dtype=taps.dtype)
+
+    def __call__(self, x):
+        x = np.concatenate((self._tail, x))
+        y = upfirdn(self.taps, x, up=1, down=self.factor)
+        n_out = (len(x) - 1) // self.factor + 1
+        self._tail = x[max(n_out - self._first, 0) * self.factor:]
+        return y[self._first:n_out]
 
 
 # ----------------------
-# PASS PREDICTION
+# IQ ring buffer: async USB reader -> processing thread
 # ----------------------
 
-def get_local_passes(sat, minutes_ahead=24*60, step_minutes=1, elev_mask_deg=10):
-    t0 = datetime.utcnow().replace(tzinfo=timezone.utc)
-    t1 = t0 + timedelta(minutes=minutes_ahead)
+RING_SLOTS = 32          # 32 x CHUNK_SECONDS ≈ 1.7 s of IQ headroom
+READ_TIMEOUT_S = 2.0     # consumer gives up if the SDR stops delivering
+WAV_WRITE_BUFFER = 512 * 1024  # io buffer for the WAV file (~22 s of audio)
+
 
-    # generate skyfield times for evaluation
-    times = ts.utc([t0 + timedelta(minutes=i * step_minutes) for i in range(int(minutes_ahead / step_minutes) + 1)])
+class IQRing:
+    """Single-producer/single-consumer ring of fixed-size raw IQ blocks.
 
-    geoc = wgs84.latlon(MY_LAT, MY_LON, elevation_m=MY_ELEV_M)
-    altaz = (sat - geoc).at(times).altaz()
-    altitudes = altaz[0].degrees
+    The SDR callback copies each USB block into the next free slot and the
+    processing thread drains slots in order. Only the producer advances
+    `head` and only the consumer advances `tail`, so no lock is taken; the
+    semaphore only wakes the consumer. Blocks arriving while the ring is
+    full are dropped and counted.
+    """
 
-    passes = []
-    inpass = False
-    start = None
+    def __init__(self, slots, block_bytes):
+        self.buf = np.empty((slots, block_bytes), dtype=np.uint8)
+        self.slots = slots
+        self.head = 0
+        self.tail = 0
+        self.dropped = 0
+        self._ready = threading.Semaphore(0)
 
-    for i, alt in enumerate(altitudes):
-        if alt >= elev_mask_deg and not inpass:
-            inpass = True
-            start = t0 + timedelta(minutes=i * step_minutes)
-        if alt < elev_mask_deg and inpass:
-            end = t0 + timedelta(minutes=i * step_minutes)
-            passes.append((start, end))
-            inpass = False
+    def push(self, data, _context=None):
+        if self.head - self.tail >= self.slots:
+            self.dropped += 1
+            return
+        self.buf[self.head % self.slots] = np.frombuffer(data, dtype=np.uint8)
+        self.head += 1
+        self._ready.release()
 
-    if inpass:
-        passes.append((start, t1))
+    def pop(self, timeout=None):
+        """Next filled slot (a view), or None on timeout. Call release() when done with it."""
+        if not self._ready.acquire(timeout=timeout):
+            return None
+        return self.buf[self.tail % self.slots]
 
-    return passes
+    def release(self):
+        self.tail += 1
 
 
 # ----------------------
-# FM demod + decimation helper
+# SDR handle: opened once, kept warm between passes
 # ----------------------
 
-def fm_demodulate(iq, prev_sample=None):
-    # iq: complex64 array
-    # return float array of instantaneous frequency (unscaled)
-    if prev_sample is not None:
-        iq = np.concatenate(([prev_sample], iq))
-    ph = np.angle(iq[1:] * np.conj(iq[:-1]))
-    return ph, iq[-1]
+def get_sdr():
+    """Shared RtlSdr, opened on first use and kept open between passes.
+
+    Re-opening the device re-initialises the tuner/PLL and USB buffers on
+    every pass; retuning an open handle is just a register write.
+    Callers must hold _sdr_lock.
+    """
+    global _sdr
+    if _sdr is None:
+        _sdr = RtlSdr()
+        _sdr.sample_rate = RTL_SAMPLE_RATE
+        _sdr.gain = 'auto'
+    return _sdr
+
+
+def close_sdr():
+    global _sdr
+    if _sdr is not None:
+        try:
+            _sdr.close()
+        finally:
+            _sdr = None
+
+
+atexit.register(close_sdr)
 
 
 # ----------------------
@@ -155,82 +259,117 @@ def fm_demodulate(iq, prev_sample=None):
 # ----------------------
 
 def record_with_pyrtlsdr(freq_mhz, duration_s, outpath):
-    """Stream from RTL-SDR in chunks, demodulate FM, decimate to OUT_SAMPLE_RATE and write WAV incrementally."""
+    """Stream from RTL-SDR in chunks, demodulate FM, decimate to OUT_SAMPLE_RATE and write WAV incrementally.
+
+    USB reads run on their own thread (read_bytes_async into an IQRing) so
+    the device keeps being drained while a chunk is being processed.
+    """
     log.info("[PY-RTLSDR] Recording %ds at %.6f MHz → %s", duration_s, freq_mhz, outpath)
 
-    sdr = RtlSdr()
+    if not _sdr_lock.acquire(blocking=False):
+        log.warning("[PY-RTLSDR] SDR busy with another recording; skipping %.6f MHz", freq_mhz)
+        return
+
     try:
-        sdr.sample_rate = RTL_SAMPLE_RATE
+        sdr = get_sdr()
         sdr.center_freq = freq_mhz * 1e6
-        sdr.gain = 'auto'
 
+        # whole chunks only; overshoots duration_s by < CHUNK_SECONDS
         total_chunks = max(1, int(np.ceil(duration_s / CHUNK_SECONDS)))
         prev_sample = None
-
-        # open wave file for streaming write
-        wf = wave.open(outpath, 'wb')
-        wf.setnchannels(1)
-        wf.setsampwidth(2)  # 16-bit PCM
-        wf.setframerate(OUT_SAMPLE_RATE)
-
-        for i in range(total_chunks):
-            # compute how many samples to read (last chunk shorter)
-            remaining = duration_s - i * CHUNK_SECONDS
-            cur_chunk_s = min(CHUNK_SECONDS, max(0.001, remaining))
-            cur_samples = int(RTL_SAMPLE_RATE * cur_chunk_s)
+        decimator = FirDecimator()
+        iq_buf = np.empty(2 * CHUNK_SAMPLES, dtype=np.float32) if fm_demod_kernel is None else None
+        demod_buf = np.empty(CHUNK_SAMPLES, dtype=np.float32)
+        abs_buf = np.empty(CHUNK_OUT_SAMPLES, dtype=np.float32)
+        pcm_buf = np.empty(CHUNK_OUT_SAMPLES, dtype=np.int16)
+
+        # open wave file for streaming write. Frames go out via writeframesraw
+        # into a large io buffer; writeframes would seek back and patch the
+        # header on every chunk, flushing the buffer each time. close() patches it
+        # once, and the with-blocks run it even when a chunk raises, so a failed
+        # recording still leaves a valid WAV of everything written so far.
+        with open(outpath, 'wb', buffering=WAV_WRITE_BUFFER) as wav_file, \
+                wave.open(wav_file, 'wb') as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)  # 16-bit PCM
+            wf.setframerate(OUT_SAMPLE_RATE)
+
+            ring = IQRing(RING_SLOTS, 2 * CHUNK_SAMPLES)
+
+            def reader():
+                try:
+                    sdr.read_bytes_async(ring.push, 2 * CHUNK_SAMPLES)
+                except Exception as e:
+                    log.exception("SDR read error: %s", e)
+
+            reader_thread = threading.Thread(target=reader, name='rtlsdr-reader', daemon=True)
+            reader_thread.start()
 
             try:
-                iq = sdr.read_samples(cur_samples)
-            except Exception as e:
-                log.exception("SDR read error: %s", e)
-                break
-
-            # FM demodulate (returns ph and last sample for continuity)
-            ph, prev_sample = fm_demodulate(iq, prev_sample)
+                for _ in range(total_chunks):
+                    block = ring.pop(timeout=READ_TIMEOUT_S)
+                    if block is None:
+                        log.error("SDR stream stalled; stopping recording early")
+                        break
+
+                    # FM demodulate (returns ph and last sample for continuity).
+                    # Runs at the full IQ rate on purpose: the APT FM signal is ~34 kHz
+                    # wide, so IQ can't be cut to 12 kS/s before the discriminator, and
+                    # an IQ pre-decimation FIR/FFT costs several times the atan2 pass.
+                    if fm_demod_kernel is not None:
+                        ph, prev_sample = fm_demodulate_u8(block, prev_sample, demod_buf)
+                    else:
+                        iq = bytes_to_iq(block, iq_buf)
+                        ph, prev_sample = fm_demodulate(iq, prev_sample)
+                    ring.release()
+
+                    # filter + decimate 2400000 -> 12000 in one polyphase pass
+                    try:
+                        audio_12k = decimator(ph)
+                    except Exception:
+                        # fallback to crude downsample (less ideal) if filtering fails
+                        audio_12k = ph[::DECIMATION]
+
+                    n = len(audio_12k)
+                    if n == 0:
+                        continue
+                    if n > len(pcm_buf):
+                        abs_buf = np.empty(n, dtype=np.float32)
+                        pcm_buf = np.empty(n, dtype=np.int16)
+
+                    # normalize small chunks separately to avoid clipping; keep global scale low.
+                    # Peak is scaled to 0.9 FS, so the int16 cast needs no clip.
+                    peak = np.abs(audio_12k, out=abs_buf[:n]).max()
+                    scale = 0.9 * 32767 / peak if peak > 0 else 0.0
+                    pcm = pcm_buf[:n]
+                    np.multiply(audio_12k, scale, out=pcm, casting='unsafe')
+                    wf.writeframesraw(pcm)
+            finally:
+                if reader_thread.is_alive():
+                    sdr.cancel_read_async()
+                reader_thread.join(timeout=READ_TIMEOUT_S)
+
+            if ring.dropped:
+                log.warning("[PY-RTLSDR] Dropped %d IQ blocks (processing fell behind)", ring.dropped)
 
-            # decimate 2400000 -> 48000
-            try:
-                audio_48k = decimate(ph, DECIMATE_STAGE1, ftype='fir', zero_phase=True)
-                # decimate 48000 -> 12000
-                audio_12k = decimate(audio_48k, DECIMATE_STAGE2, ftype='fir', zero_phase=True)
-            except Exception:
-                # fallback to crude downsample (less ideal) if decimate fails
-                audio_12k = ph[::DECIMATE_STAGE1 * DECIMATE_STAGE2]
-
-            # normalize small chunks separately to avoid clipping; keep global scale low
-            if np.max(np.abs(audio_12k)) > 0:
-                audio_12k = audio_12k / np.max(np.abs(audio_12k)) * 0.9
-
-            # convert to int16 PCM
-            pcm = np.int16(np.clip(audio_12k * 32767, -32768, 32767))
-            wf.writeframes(pcm.tobytes())
-
-        wf.close()
         log.info("[PY-RTLSDR] Saved WAV → %s", outpath)
+    except Exception:
+        # drop a possibly broken handle; the next pass reopens the device
+        close_sdr()
+        raise
     finally:
-        sdr.close()
+        _sdr_lock.release()
 
 
 # ----------------------
 # High-level recorder wrapper
 # ----------------------
 
-def run_record(freq_mhz, satname, start_time_utc=None, duration_override=None):
+def run_record(freq_mhz, satname, duration_override=None):
+    """Record now. Upcoming passes are started at AOS by a scheduler 'date' job."""
     log.info("Starting recording thread for %s @ %.6f MHz", satname, freq_mhz)
 
-    # wait until start if specified
-    if start_time_utc:
-        now = datetime.utcnow().replace(tzinfo=timezone.utc)
-        if isinstance(start_time_utc, str):
-            start_ts = datetime.fromisoformat(start_time_utc)
-        else:
-            start_ts = start_time_utc
-        delta = (start_ts - now).total_seconds()
-        if delta > 0:
-            log.info("Waiting %.1fs until start %s", delta, start_ts)
-            time.sleep(delta)
-
-    tnow = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    tnow = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
     out = RECORD_DIR / f"{satname.replace(' ', '_')}_{tnow}_{int(freq_mhz*1000)}kHz.wav"
 
     duration_s = duration_override or 60
@@ -255,7 +394,8 @@ def run_record(freq_mhz, satname, start_time_utc=None, duration_override=None):
 # ----------------------
 
 def job_check_and_schedule():
-    now = datetime.utcnow().replace(tzinfo=timezone.utc)
+    now = datetime.now(timezone.utc)
+    now_ts = now.timestamp()
     log.info("Scheduler tick at %s", now.isoformat())
 
     try:
@@ -266,15 +406,20 @@ def job_check_and_schedule():
 
     next_events = []
 
+    # passes for all satellites are predicted once per bucket.
+    # Kept serial: a prediction is a few ms per satellite per bucket, far less
+    # than worker start-up (spawn re-imports this module) plus IPC would cost.
+    t0 = prediction_epoch(now, PREDICT_REFRESH_MINUTES)
+    all_passes = cached_passes(sats, t0, PREDICT_MINUTES_AHEAD)
+
     for satcfg in config.get('satellites', []):
         name = satcfg['name']
         freq = float(satcfg['freq_mhz'])
 
-        sat = sats.get(name)
-        if not sat:
+        if name not in sats:
             continue
 
-        passes = get_local_passes(sat, minutes_ahead=12*60)
+        passes = all_passes[name]
 
         # find next future pass
         future = next((p for p in passes if p[0] > now), None)
@@ -282,22 +427,34 @@ def job_check_and_schedule():
             next_events.append((name, future[0]))
 
         for aos_utc, los_utc in passes:
-            start = aos_utc - timedelta(seconds=20)
-            stop = los_utc + timedelta(seconds=20)
-            duration = int((stop - start).total_seconds())
+            # window checks on epoch seconds: float compares, no timedelta objects
+            start_ts = aos_utc.timestamp() - PASS_MARGIN_S
+            stop_ts = los_utc.timestamp() + PASS_MARGIN_S
+            duration = int(stop_ts - start_ts)
 
-            if start <= now <= stop:
+            if start_ts <= now_ts <= stop_ts:
                 with active_lock:
                     if name not in active_recordings:
                         active_recordings.add(name)
-                        threading.Thread(target=run_record, args=(freq, name, None, duration), daemon=True).start()
+                        # no trigger: runs now on the scheduler's pool, not a fresh thread.
+                        # No misfire limit either: a skipped job would never clear
+                        # active_recordings, and the satellite would not be recorded again
+                        sched.add_job(run_record, args=(freq, name, duration),
+                                      id=f"rec_{name}_{aos_utc.isoformat()}", replace_existing=True,
+                                      misfire_grace_time=None)
                 break
 
-            elif start > now and (start - now) < timedelta(minutes=10):
+            elif 0 < start_ts - now_ts < SCHEDULE_AHEAD_S:
+                start = datetime.fromtimestamp(start_ts, timezone.utc)
                 with active_lock:
                     if name not in active_recordings:
                         active_recordings.add(name)
-                        threading.Thread(target=run_record, args=(freq, name, start, duration), daemon=True).start()
+                        # fire at `start` from the scheduler instead of a thread sleeping
+                        # until AOS; no misfire limit, so run_record always runs and
+                        # clears active_recordings even if the scheduler is late
+                        sched.add_job(run_record, 'date', run_date=start, args=(freq, name, duration),
+                                      id=f"rec_{name}_{start.isoformat()}", replace_existing=True,
+                                      misfire_grace_time=None)
                 break
 
     if next_events:
@@ -315,25 +472,21 @@ def main():
     log.info("Starting optimized recorder")
 
     # initial load
-    load_config(force=True)
+    load_config()
 
-    # start scheduler
-    sched = BackgroundScheduler()
-    sched.add_job(job_check_and_schedule, 'interval', seconds=60)
+    # start scheduler; the first check runs on the scheduler right away,
+    # and a slow or late tick is coalesced instead of overlapping the next
+    sched.add_job(job_check_and_schedule, 'interval', seconds=60,
+                  coalesce=True, max_instances=1, misfire_grace_time=60,
+                  next_run_time=datetime.now(timezone.utc))
     sched.start()
 
-    # run initial check immediately
-    job_check_and_schedule()
-
     try:
-        # keep main thread alive
+        # keep main thread alive; config changes are picked up by the scheduler
+        # tick (load_config() reloads when the file mtime changes), so there is
+        # nothing to poll here. time.sleep stays interruptible by Ctrl-C on Windows.
         while True:
-            time.sleep(1)
-            # auto reload config if file changed
-            try:
-                load_config()
-            except Exception:
-                pass
+            time.sleep(3600)
     except KeyboardInterrupt:
         log.info('Stopping...')
         sched.shutdown()
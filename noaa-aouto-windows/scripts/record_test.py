@@ -19,7 +19,7 @@ def fake_record(satname, start_time_iso=None, duration_override=None, freq_mhz=N
     Simulerar inspelning. Returnerar sökväg till 'fake' fil.
     Väntar tills start_time om det anges.
     """
-    now = datetime.utcnow().replace(tzinfo=timezone.utc)
+    now = datetime.now(timezone.utc)
 
     # Vänta tills start_time om det finns
     if start_time_iso:
@@ -28,7 +28,7 @@ def fake_record(satname, start_time_iso=None, duration_override=None, freq_mhz=N
         if delta > 0:
             print(f"[FAKE] Sleeping {delta:.1f}s until start {start_ts.isoformat()}Z")
             time.sleep(delta)
-        now = datetime.utcnow().replace(tzinfo=timezone.utc)
+        now = datetime.now(timezone.utc)
 
     tnow = now.strftime("%Y%m%d_%H%M%S")
     fake_file = RECORD_DIR / f"{satname}_{tnow}_FAKE.wav"
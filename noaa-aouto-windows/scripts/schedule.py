@@ -1,72 +1,54 @@
 
-import sys
-from pathlib import Path
 from datetime import datetime, timezone, timedelta
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.blocking import BlockingScheduler
-from skyfield.api import Loader, EarthSatellite, wgs84
-import yaml
+from passes import load_config, get_all_passes
 from record_test import fake_record  # bara för att testa programmet utan antenn
 # from record import run_record #avkomentera när programmet ska köras med antenn
-import threading
 
-BASE = Path(__file__).resolve().parents[1]
-CONFIG = BASE / "config" / "satellites.yaml"
+# Modulnivå så att plan_day() kan lägga in date-jobb för kommande pass.
+# Begränsad trådpool: planering och inspelningar delar högst 4 arbetstrådar.
+scheduler = BlockingScheduler(executors={"default": ThreadPoolExecutor(4)})
 
-# kordinater för origovägen 4
-#blir predict någon minut fel kan det vara så att tle filen behöver updateras.
-MY_LAT = 57.69
-MY_LON = 11.97
-MY_ELEV_M = 0
+PLAN_JOB_ID = "plan_day"
+PLAN_HOURS = 24     # hur långt fram varje plan räknar pass
+REPLAN_HOURS = 6    # ny plan så här ofta, och direkt när satellites.yaml ändras
 
-loader = Loader(str(BASE / "tle"))
-ts = loader.timescale()
+# (satellitnamn, AOS-minut sedan epoch) för pass som redan spelats in eller köats.
+# AOS interpoleras och kan flytta sig någon sekund mellan planeringar, så en
+# nyckel kan hamna på grannminuten; jämför därför med SAME_PASS_MIN tolerans.
+_SCHEDULED = set()
+SAME_PASS_MIN = 2
+_planned_sats = None  # sats-objektet den senaste planen byggdes på
 
 
-def load_tles():
-    """Läser in TLE-data från YAML-konfig."""
-    data = yaml.safe_load(CONFIG.read_text())
-    sats = {}
-    for satcfg in data["satellites"]:
-        name = satcfg["name"]
-        tle1 = satcfg["tle1"]
-        tle2 = satcfg["tle2"]
-        sats[name] = EarthSatellite(tle1, tle2, name, ts)
-    return sats
-
-
-def get_local_passes(sat, minutes_ahead=24 * 60, step_minutes=1, elev_mask_deg=10):
-    """Beräknar alla satellitpass över mottagarens position."""
-    t0 = datetime.utcnow().replace(tzinfo=timezone.utc)
-    t1 = t0 + timedelta(minutes=minutes_ahead)
-    times = ts.utc([t0 + timedelta(minutes=i) for i in range(0, minutes_ahead, step_minutes)])
-    geoc = wgs84.latlon(MY_LAT, MY_LON, elevation_m=MY_ELEV_M)
-    altitudes = (sat - geoc).at(times).altaz()[0].degrees
-    passes = []
-    inpass = False
-    start = None
-
-    for i, alt in enumerate(altitudes):
-        if alt >= elev_mask_deg and not inpass:
-            inpass = True
-            start = t0 + timedelta(minutes=i * step_minutes)
-        if alt < elev_mask_deg and inpass:
-            end = t0 + timedelta(minutes=i * step_minutes)
-            passes.append((start, end))
-            inpass = False
-
-    if inpass:
-        passes.append((start, t1))
-    return passes
-
-
-def job():
-    """Körs varje minut: uppdaterar pass och startar fake_record vid behov."""
-    print("Job tick:", datetime.utcnow().isoformat() + "Z")
-    sats = load_tles()
-    config = yaml.safe_load(CONFIG.read_text())
+def _already_scheduled(name, aos_min):
+    """Sant om ett pass för satelliten med AOS inom ±SAME_PASS_MIN minuter redan hanterats."""
+    return any(n == name and abs(m - aos_min) <= SAME_PASS_MIN for n, m in _SCHEDULED)
+
+
+def plan_day():
+    """Räknar ut alla pass kommande dygn och lägger ett date-jobb per pass."""
+    global _planned_sats
+    now = datetime.now(timezone.utc)
+    now_ts = now.timestamp()
+    print("Planning:", now.isoformat())
+    config, sats = load_config()
+    _planned_sats = sats
     next_events = []
 
-    now = datetime.utcnow().replace(tzinfo=timezone.utc)
+    # glöm pass vars AOS ligger mer än en timme bak i tiden
+    cutoff = int(now_ts - 3600) // 60
+    _SCHEDULED.difference_update([k for k in _SCHEDULED if k[1] < cutoff])
+
+    # ny plan ersätter alla väntande inspelningsjobb (TLE:erna kan ha ändrats)
+    for j in scheduler.get_jobs():
+        if j.id.startswith("rec-"):
+            j.remove()
+
+    # börja sökningen en stund bakåt så att ett pågående pass får sin riktiga AOS
+    all_passes = get_all_passes(sats, now - timedelta(minutes=30),
+                                now + timedelta(hours=PLAN_HOURS), elev_mask_deg=10)
 
     for satcfg in config["satellites"]:
         name = satcfg["name"]
@@ -76,42 +58,68 @@ def job():
             print(f"[WARN] Satellite {name} not found in YAML TLEs.")
             continue
 
-        sat = sats[name]
-        passes = get_local_passes(sat, minutes_ahead=12 * 60, step_minutes=1, elev_mask_deg=10)
-
         # Hitta nästa pass i framtiden
-        future_pass = next((p for p in passes if p[0] > now), None)
+        future_pass = next((p for p in all_passes[name] if p[0] > now), None)
         if future_pass:
-            aos_utc, _los_utc = future_pass
-            next_events.append((name, aos_utc))
-
-        # Kolla om vi är inne i ett pass just nu, eller nära ett kommande
-        for p in passes:
-            aos_utc, los_utc = p
-            start = aos_utc - timedelta(seconds=30)
-            stop = los_utc + timedelta(seconds=30)
-
-            if start <= now <= stop:
-                duration = int((stop - now).total_seconds())
+            next_events.append((name, future_pass[0]))
+
+        for aos_utc, los_utc in all_passes[name]:
+            # jämförelser i epoch-sekunder i stället för timedelta-aritmetik
+            aos_ts = aos_utc.timestamp()
+            start_ts = aos_ts - 30
+            stop_ts = los_utc.timestamp() + 30
+            if stop_ts < now_ts:
+                continue
+            key = (name, int(aos_ts) // 60)
+            job_id = f"rec-{name}-{key[1]}"
+
+            if start_ts <= now_ts:
+                if _already_scheduled(*key):
+                    continue  # redan igång
+                _SCHEDULED.add(key)
+                duration = int(stop_ts - now_ts)
                 print(f"[INFO] In-pass now for {name} — starting fake_record for {duration}s")
-                fake_record(name, None, duration)
-
-            elif start > now and (start - now) < timedelta(minutes=10):
-                duration = int((stop - start).total_seconds())
-                print(f"[INFO] Upcoming pass for {name} at {start.isoformat()}Z — scheduling fake_record")
-                fake_record(name, start.isoformat(), duration)
+                # utan trigger körs jobbet direkt i schedulerns trådpool; ingen
+                # misfire-gräns, annars hoppas det över om alla trådar är upptagna
+                # och nyckeln i _SCHEDULED gör att det aldrig försöks igen
+                scheduler.add_job(fake_record, args=(name, None, duration, freq),
+                                  id=job_id, replace_existing=True, misfire_grace_time=None)
+            else:
+                _SCHEDULED.add(key)
+                duration = int(stop_ts - start_ts)
+                scheduler.add_job(fake_record, "date",
+                                  run_date=datetime.fromtimestamp(start_ts, timezone.utc),
+                                  args=(name, None, duration, freq),
+                                  id=job_id, replace_existing=True, misfire_grace_time=None)
 
     # Lista nästa pass
     print("---- NEXT PASSES ----")
     for satname, aos in next_events:
         delta_min = (aos - now).total_seconds() / 60
         print(f"{satname}: {aos.isoformat()}Z  (om {delta_min:.1f} min)")
-    print("Job done.\n")
+    print("Planning done.\n")
+
+
+def health_check():
+    """Var 30:e minut: planerar om direkt om satellites.yaml ändrats, annars en statusrad."""
+    _config, sats = load_config()
+    if sats is not _planned_sats:
+        print("[INFO] satellites.yaml changed — replanning")
+        # via det schemalagda jobbet, så att max_instances=1 gäller och två
+        # planeringar aldrig ändrar _SCHEDULED och rec-jobben samtidigt
+        scheduler.modify_job(PLAN_JOB_ID, next_run_time=datetime.now(timezone.utc))
+        return
+    queued = sum(1 for j in scheduler.get_jobs() if j.id.startswith("rec-"))
+    print(f"Health: {queued} recordings queued")
 
 
 if __name__ == "__main__":
-    scheduler = BlockingScheduler()
-    scheduler.add_job(job, "interval", minutes=1, max_instances=3)
+    # första planen körs av schedulern direkt vid start i stället för synkront här;
+    # coalesce/max_instances=1 så att en sen eller långsam körning aldrig överlappar
+    scheduler.add_job(plan_day, "interval", hours=REPLAN_HOURS, id=PLAN_JOB_ID,
+                      coalesce=True, max_instances=1, misfire_grace_time=300,
+                      next_run_time=datetime.now(timezone.utc))
+    scheduler.add_job(health_check, "interval", minutes=30,
+                      coalesce=True, max_instances=1, misfire_grace_time=300)
     print("Starting scheduler. Press Ctrl-C to exit.")
-    job()  
     scheduler.start()